@@ -12,15 +12,39 @@ Usage:
 import os
 import sys
 import json
+import functools
+import mmap
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 DARWIN_DIR = Path.home() / ".claude" / "darwin"
 TELEMETRY_DIR = DARWIN_DIR / "telemetry"
 SKILLS_DIR = DARWIN_DIR / "skills"
 AFFINITY_FILE = DARWIN_DIR / "affinity_matrix.json"
+# Binary copy of AFFINITY_FILE, written alongside it when msgpack is installed
+AFFINITY_PACK_FILE = DARWIN_DIR / "affinity_matrix.mpack"
 
 # Task type classification keywords
 TASK_PATTERNS = {
@@ -33,6 +57,37 @@ TASK_PATTERNS = {
     "generation": ["create", "generate", "scaffold", "new", "add", "build"],
 }
 
+# Frozen as interned tuples; classify_task is generated from these at import
+TASK_PATTERNS = {t: tuple(sys.intern(kw) for kw in kws) for t, kws in TASK_PATTERNS.items()}
+
+
+def _build_classifier():
+    """Generate a straight-line scorer with one substring test per keyword."""
+    task_types = tuple(TASK_PATTERNS)
+    lines = [
+        "def _classify_impl(s):",
+        "    s = s.lower()",
+        f"    sc = [0] * {len(task_types)}",
+    ]
+    for idx, keywords in enumerate(TASK_PATTERNS.values()):
+        for kw in keywords:
+            lines.append(f"    if {kw!r} in s: sc[{idx}] += 1")
+    # sc.index() returns the first maximum, so ties go to the earlier task type
+    lines += [
+        "    best = max(sc)",
+        "    return _TASK_TYPES[sc.index(best)] if best else 'generation'",
+    ]
+    namespace = {"_TASK_TYPES": task_types}
+    exec("\n".join(lines), namespace)
+    return namespace["_classify_impl"]
+
+
+_classify_impl = _build_classifier()
+
+# Score -> display lookups: marker by int(score * 5), bar by int(score * 10)
+_MARKERS = ("  ", "  ", "░░", "▓▓", "██")
+_BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))
+
 # Default affinity scores (before learning)
 DEFAULT_AFFINITY = {
     "research": {
@@ -69,10 +124,21 @@ DEFAULT_AFFINITY = {
 
 def load_affinity_matrix() -> Dict:
     """Load the affinity matrix from file or return default."""
+    # Prefer the msgpack copy unless a msgpack-less run has since rewritten the JSON
+    if msgpack and AFFINITY_PACK_FILE.exists():
+        try:
+            if not AFFINITY_FILE.exists() or AFFINITY_PACK_FILE.stat().st_mtime_ns >= AFFINITY_FILE.stat().st_mtime_ns:
+                return msgpack.unpackb(AFFINITY_PACK_FILE.read_bytes(), raw=False)
+        except Exception:
+            pass
+
     if AFFINITY_FILE.exists():
         try:
-            with open(AFFINITY_FILE, 'r') as f:
-                return json.load(f)
+            with open(AFFINITY_FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if orjson:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+                return json.loads(mm[:])
         except:
             pass
     return {"matrix": DEFAULT_AFFINITY, "observations": 0, "last_updated": None}
@@ -81,23 +147,20 @@ def load_affinity_matrix() -> Dict:
 def save_affinity_matrix(data: Dict):
     """Save the affinity matrix to file."""
     data["last_updated"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-    with open(AFFINITY_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    # JSON stays the source of truth during migration; the msgpack copy is
+    # written last so its mtime marks it as current
+    if orjson:
+        AFFINITY_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(AFFINITY_FILE, 'w') as f:
+            json.dump(data, f, indent=2)
+    if msgpack:
+        AFFINITY_PACK_FILE.write_bytes(msgpack.packb(data, use_bin_type=True))
 
 
 def classify_task(context: str) -> str:
     """Classify a task context into a task type."""
-    context_lower = context.lower()
-
-    scores = {}
-    for task_type, keywords in TASK_PATTERNS.items():
-        score = sum(1 for kw in keywords if kw in context_lower)
-        if score > 0:
-            scores[task_type] = score
-
-    if scores:
-        return max(scores.items(), key=lambda x: x[1])[0]
-    return "generation"  # Default
+    return _classify_impl(context)
 
 
 def get_best_modules(task_type: str, matrix: Dict = None) -> Dict[str, str]:
@@ -106,28 +169,22 @@ def get_best_modules(task_type: str, matrix: Dict = None) -> Dict[str, str]:
         data = load_affinity_matrix()
         matrix = data["matrix"]
 
+    def variant_score(item):
+        return item[1].get(task_type, 0.5)
+
     best = {}
     for module_type, variants in matrix.items():
-        best_variant = None
-        best_score = -1
-        for variant, scores in variants.items():
-            score = scores.get(task_type, 0.5)
-            if score > best_score:
-                best_score = score
-                best_variant = variant
-        if best_variant:
-            best[module_type] = {"variant": best_variant, "score": best_score}
+        if variants:
+            # max() keeps the first variant on ties, like the old strict ">" scan
+            best_variant, scores = max(variants.items(), key=variant_score)
+            best[module_type] = {"variant": best_variant, "score": scores.get(task_type, 0.5)}
 
     return best
 
 
-def update_affinity(skill: str, task_type: str, modules: Dict[str, str], fitness_delta: float):
-    """Update affinity matrix based on observed fitness change."""
-    data = load_affinity_matrix()
-    matrix = data["matrix"]
-
+def _apply_update(matrix: Dict, observations: int, task_type: str, modules: Dict[str, str], fitness_delta: float) -> Dict:
+    """Apply one observed fitness change to an in-memory matrix."""
     # Learning rate decays with observations
-    observations = data.get("observations", 0)
     learning_rate = max(0.05, 0.3 / (1 + observations * 0.01))
 
     for module_type, variant in modules.items():
@@ -138,6 +195,14 @@ def update_affinity(skill: str, task_type: str, modules: Dict[str, str], fitness
             new_score = max(0.1, min(0.99, current + adjustment))
             matrix[module_type][variant][task_type] = round(new_score, 3)
 
+    return matrix
+
+
+def update_affinity(skill: str, task_type: str, modules: Dict[str, str], fitness_delta: float):
+    """Update affinity matrix based on observed fitness change."""
+    data = load_affinity_matrix()
+    observations = data.get("observations", 0)
+    _apply_update(data["matrix"], observations, task_type, modules, fitness_delta)
     data["observations"] = observations + 1
     save_affinity_matrix(data)
 
@@ -155,33 +220,24 @@ def print_matrix():
     print()
 
     task_types = list(TASK_PATTERNS.keys())
+    # Every row has the same shape, so build the layout and header once
+    row_fmt = "{:<10}" + "{:>10}" * len(task_types)
+    header = row_fmt.format("Variant", *(tt[:8] for tt in task_types))
 
     for module_type, variants in matrix.items():
         print(f"{module_type.upper()}")
         print("───────────────────────────────────────────────────")
-
-        # Header
-        header = f"{'Variant':<10}"
-        for tt in task_types:
-            header += f"{tt[:8]:>10}"
         print(header)
 
         # Rows
         for variant, scores in variants.items():
-            row = f"{variant:<10}"
+            cells = []
             for tt in task_types:
                 score = scores.get(tt, 0.5)
-                # Color code (using ASCII)
-                if score >= 0.8:
-                    marker = "██"
-                elif score >= 0.6:
-                    marker = "▓▓"
-                elif score >= 0.4:
-                    marker = "░░"
-                else:
-                    marker = "  "
-                row += f"{marker}{score:.2f}".rjust(10)
-            print(row)
+                # Color code: ██ ≥0.8, ▓▓ ≥0.6, ░░ ≥0.4
+                marker = _MARKERS[min(max(int(score * 5), 0), 4)]
+                cells.append("%s%.2f" % (marker, score))
+            print(row_fmt.format(variant, *cells))
         print()
 
     print("═══════════════════════════════════════════════════")
@@ -205,13 +261,50 @@ def print_suggestion(task_context: str):
     for module, info in sorted(best.items(), key=lambda x: x[1]["score"], reverse=True):
         score = info["score"]
         variant = info["variant"]
-        bar = "█" * int(score * 10) + "░" * (10 - int(score * 10))
+        bar = _BARS[min(max(int(score * 10), 0), 10)]
         print(f"  {module:12} → {variant:4}  {bar}  {score:.2f}")
 
     print()
     print("═══════════════════════════════════════════════════")
 
 
+@functools.lru_cache(maxsize=None)
+def _load_skill_modules(skill: str) -> Optional[Dict[str, str]]:
+    """Load a skill's module variants, parsing each skill file once per process."""
+    skill_file = SKILLS_DIR / f"{skill}.yaml"
+    if not skill_file.exists():
+        return None
+    with open(skill_file, 'r') as f:
+        skill_def = yaml.load(f, Loader=_YamlLoader)
+    if not isinstance(skill_def, dict):
+        return None
+    modules = skill_def.get("modules")
+    if not isinstance(modules, dict):
+        return {}
+    return {m: v for m, v in modules.items() if isinstance(v, str)}
+
+
+def _iter_session_events(session_file: str):
+    """Yield the events of a telemetry session, streaming them when ijson is available."""
+    if ijson:
+        with open(session_file, 'rb') as f:
+            yield from ijson.items(f, "events.item")
+        return
+    if orjson:
+        with open(session_file, 'rb') as f:
+            session = orjson.loads(f.read())
+    else:
+        with open(session_file, 'r') as f:
+            session = json.load(f)
+    events = session.get("events") if isinstance(session, dict) else None
+    if isinstance(events, list):
+        yield from events
+
+
+# Errors that end reading a session file early
+_SESSION_READ_ERRORS = (OSError, ValueError, TypeError) + ((ijson.JSONError,) if ijson else ())
+
+
 def learn_from_telemetry():
     """Update affinity matrix from telemetry data."""
     print("Learning from telemetry...")
@@ -222,37 +315,48 @@ def learn_from_telemetry():
         print("No telemetry sessions found.")
         return
 
-    updates = 0
-    for session_file in sessions_dir.glob("*.json"):
-        try:
-            with open(session_file, 'r') as f:
-                session = json.load(f)
-
-            for event in session.get("events", []):
-                skill = event.get("skill")
-                context = event.get("context", "")
-                completed = event.get("completed", False)
+    # Load once, apply every observation in memory, then write once
+    data = load_affinity_matrix()
+    data.setdefault("observations", 0)
 
-                if skill and context:
-                    # Classify task
+    updates = 0
+    with os.scandir(sessions_dir) as entries:
+        session_files = [e.path for e in entries if e.name.endswith(".json")]
+
+    # Observations from good sessions are saved even if a later one breaks the run
+    try:
+        for session_file in session_files:
+            try:
+                for event in _iter_session_events(session_file):
+                    if not isinstance(event, dict):
+                        continue
+                    skill = event.get("skill")
+                    context = event.get("context")
+                    if not (skill and context and isinstance(skill, str) and isinstance(context, str)):
+                        continue
+
+                    # Get skill modules; skip skills without a usable definition
+                    try:
+                        modules = _load_skill_modules(skill)
+                    except (OSError, UnicodeDecodeError, yaml.YAMLError):
+                        continue
+                    if modules is None:
+                        continue
+
+                    # Classify task and infer fitness delta from completion
                     task_type = classify_task(context)
-
-                    # Get skill modules
-                    skill_file = SKILLS_DIR / f"{skill}.yaml"
-                    if skill_file.exists():
-                        with open(skill_file, 'r') as f:
-                            skill_def = yaml.safe_load(f)
-                        modules = skill_def.get("modules", {})
-
-                        # Infer fitness delta from completion
-                        fitness_delta = 0.05 if completed else -0.02
-
-                        # Update affinity
-                        update_affinity(skill, task_type, modules, fitness_delta)
-                        updates += 1
-        except Exception as e:
-            continue
-
+                    fitness_delta = 0.05 if event.get("completed", False) else -0.02
+
+                    # Update affinity
+                    _apply_update(data["matrix"], data["observations"], task_type, modules, fitness_delta)
+                    data["observations"] += 1
+                    updates += 1
+            except _SESSION_READ_ERRORS:
+                # Unreadable or truncated session; events read before the damage still count
+                continue
+    finally:
+        if updates:
+            save_affinity_matrix(data)
     print(f"Applied {updates} observations to affinity matrix.")
 
 
@@ -4,49 +4,71 @@ Create Darwin tracking wrappers for external skills.
 """
 
 import os
+import re
 import sys
 import yaml
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 DARWIN_DIR = Path.home() / ".claude" / "darwin"
 SKILLS_DIR = DARWIN_DIR / "skills"
 EXTERNAL_SKILLS_DIR = DARWIN_DIR / ".agents" / "skills"
 
+# Wrappers have a fixed shape, so they are formatted directly rather than
+# going through yaml.dump; scalars are quoted the same way yaml.dump would.
+_WRAPPER_TMPL = """\
+name: {name}
+version: 1.0.0
+description: {description}
+source: {source}
+external: true
+modules:
+  input: v2
+  research: v3
+  structure: v1
+  output: v1
+  workflow: v3
+  validation: v3
+installed_at: '{installed_at}'
+fitness_history: []
+"""
+
+_PLAIN_SCALAR_RE = re.compile(r"[A-Za-z_][\w./-]*\Z")
+_YAML_RESERVED = {"y", "n", "yes", "no", "on", "off", "true", "false", "null"}
+
+def _yaml_str(value: str) -> str:
+    """Render a string as a YAML scalar, quoting only when needed."""
+    if _PLAIN_SCALAR_RE.match(value) and value.lower() not in _YAML_RESERVED:
+        return value
+    return "'" + value.replace("'", "''") + "'"
+
 def create_wrapper(skill_name: str, source: str = "skills.sh"):
     """Create a Darwin YAML wrapper for an external skill."""
 
-    wrapper = {
-        "name": skill_name,
-        "version": "1.0.0",
-        "description": f"External skill from {source}: {skill_name}",
-        "source": source,
-        "external": True,
-        "modules": {
-            "input": "v2",
-            "research": "v3",
-            "structure": "v1",
-            "output": "v1",
-            "workflow": "v3",
-            "validation": "v3"
-        },
-        "installed_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "fitness_history": []
-    }
+    wrapper = _WRAPPER_TMPL.format(
+        name=_yaml_str(skill_name),
+        description=_yaml_str(f"External skill from {source}: {skill_name}"),
+        source=_yaml_str(source),
+        installed_at=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )
 
     wrapper_path = SKILLS_DIR / f"{skill_name}.yaml"
 
     # Don't overwrite existing Darwin skills
     if wrapper_path.exists():
         with open(wrapper_path, 'r') as f:
-            existing = yaml.safe_load(f)
+            existing = yaml.load(f, Loader=_YamlLoader)
         if not existing.get("external"):
             print(f"  Skipping {skill_name} - existing Darwin skill")
             return False
 
     SKILLS_DIR.mkdir(parents=True, exist_ok=True)
-    with open(wrapper_path, 'w') as f:
-        yaml.dump(wrapper, f, default_flow_style=False, sort_keys=False)
+    wrapper_path.write_text(wrapper)
 
     print(f"  ✓ Created wrapper for {skill_name}")
     return True
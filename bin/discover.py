@@ -4,22 +4,39 @@ Darwin Skill Discovery - Fetch trending skills from multiple sources
 """
 
 import json
+import math
+import mmap
 import os
+import queue
 import re
 import sys
+import threading
+import urllib.error
 import urllib.request
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DARWIN_DIR = Path.home() / ".claude" / "darwin"
 SKILLS_DIR = DARWIN_DIR / "skills"
 DISCOVERY_CACHE = DARWIN_DIR / "discovery"
 
 # Primary source (may not be available)
 SKILLS_SH_URL = "https://skills.sh/trending"
+_SKILLS_SH_RE = re.compile(r'\{"source":"([^"]+)","skillId":"([^"]+)","name":"([^"]+)","installs":(\d+)\}')
 
 # GitHub API for searching Claude Code related repos
 GITHUB_API_URL = "https://api.github.com/search/repositories"
+# Seconds to wait on skills.sh before also querying GitHub
+GITHUB_HEDGE_DELAY = 1.0
+# Last GitHub search response and its ETag, for If-None-Match revalidation
+GITHUB_RESPONSE_CACHE = DISCOVERY_CACHE / "github_search.json"
+GITHUB_ETAG_FILE = DISCOVERY_CACHE / "github_etag.txt"
 
 # Curated fallback skills - popular Claude Code extensions & patterns
 CURATED_SKILLS = [
@@ -117,6 +134,29 @@ SKILL_CATEGORIES = {
     "security": ["security", "auth", "oauth"],
 }
 
+# Inverted index for categorize_skill: one overlapping regex scan finds the
+# longest keyword at each position, and _CAT_KW_IMPLIES adds the keywords
+# nested inside it (e.g. "vitest" also contains "test").
+_KW_TO_CATS = {
+    kw: [cat for cat, keywords in SKILL_CATEGORIES.items() if kw in keywords]
+    for keywords in SKILL_CATEGORIES.values()
+    for kw in keywords
+}
+_CAT_RE = re.compile("(?=(" + "|".join(map(re.escape, sorted(_KW_TO_CATS, key=len, reverse=True))) + "))")
+_CAT_KW_IMPLIES = {kw: [other for other in _KW_TO_CATS if other in kw] for kw in _KW_TO_CATS}
+
+# Darwin skills whose usage hints at a category, and the compact
+# `"skill":"<name>"` bytes jq -c writes for them in invocations.jsonl
+USAGE_SKILL_CATEGORIES = {
+    "plan": ["react"],
+    "scaffold": ["react"],
+    "techdebt": ["testing"],
+    "build-fix": ["testing"],
+    "commit": ["devops"],
+    "design-audit": ["design"],
+}
+_USAGE_NEEDLES = tuple(b'"skill":"' + skill.encode() + b'"' for skill in USAGE_SKILL_CATEGORIES)
+
 
 def fetch_from_skills_sh():
     """Fetch trending skills from skills.sh (primary source)"""
@@ -125,12 +165,11 @@ def fetch_from_skills_sh():
             SKILLS_SH_URL,
             headers={"User-Agent": "Darwin-Skills/1.1.0"}
         )
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with urllib.request.urlopen(req, timeout=5) as response:
             html = response.read().decode("utf-8")
 
         skills = []
-        pattern = r'\{"source":"([^"]+)","skillId":"([^"]+)","name":"([^"]+)","installs":(\d+)\}'
-        matches = re.findall(pattern, html)
+        matches = _SKILLS_SH_RE.findall(html)
 
         for match in matches:
             source, skill_id, name, installs = match
@@ -147,6 +186,13 @@ def fetch_from_skills_sh():
         return None
 
 
+def _write_atomic(path: Path, data: bytes):
+    """Write data through a temp file, so readers never see a partial file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
 def fetch_from_github():
     """Fetch Claude Code related repos from GitHub API (fallback)"""
     try:
@@ -159,15 +205,36 @@ def fetch_from_github():
         all_repos = []
         for query in queries[:1]:  # Just first query to avoid rate limits
             url = f"{GITHUB_API_URL}?q={query}&sort=stars&per_page=10"
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": "Darwin-Skills/1.1.0",
-                    "Accept": "application/vnd.github.v3+json"
-                }
-            )
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode("utf-8"))
+            headers = {
+                "User-Agent": "Darwin-Skills/1.1.0",
+                "Accept": "application/vnd.github.v3+json"
+            }
+            # A 304 reply costs no rate limit and sends no body
+            if GITHUB_ETAG_FILE.exists() and GITHUB_RESPONSE_CACHE.exists():
+                headers["If-None-Match"] = GITHUB_ETAG_FILE.read_text().strip()
+            req = urllib.request.Request(url, headers=headers)
+            try:
+                with urllib.request.urlopen(req, timeout=5) as response:
+                    body = response.read()
+                    etag = response.headers.get("ETag")
+                data = json.loads(body.decode("utf-8"))
+                # The ETag is dropped first and written last, so an interrupted
+                # write never pairs it with a body it doesn't describe
+                DISCOVERY_CACHE.mkdir(parents=True, exist_ok=True)
+                if GITHUB_ETAG_FILE.exists():
+                    GITHUB_ETAG_FILE.unlink()
+                _write_atomic(GITHUB_RESPONSE_CACHE, body)
+                if etag:
+                    _write_atomic(GITHUB_ETAG_FILE, etag.encode("utf-8"))
+            except urllib.error.HTTPError as e:
+                if e.code != 304:
+                    raise
+                try:
+                    data = json.loads(GITHUB_RESPONSE_CACHE.read_bytes().decode("utf-8"))
+                except ValueError:
+                    # Unreadable cache: drop the ETag so the next run refetches
+                    GITHUB_ETAG_FILE.unlink()
+                    raise
 
             for repo in data.get("items", []):
                 all_repos.append({
@@ -184,14 +251,38 @@ def fetch_from_github():
         return None
 
 
+def _start_daemon(fetch) -> queue.Queue:
+    """Run a fetcher on a daemon thread; its result (None on error) arrives on the queue.
+
+    A daemon thread is never joined at exit, so an unneeded result doesn't delay the run.
+    """
+    results = queue.Queue(maxsize=1)
+
+    def run():
+        try:
+            results.put(fetch())
+        except Exception:
+            results.put(None)
+
+    threading.Thread(target=run, daemon=True).start()
+    return results
+
+
 def fetch_trending_skills():
     """Fetch trending skills from multiple sources with fallbacks"""
     print("Fetching skill recommendations...")
     print()
 
-    # Try skills.sh first
+    # Try skills.sh first; GitHub is only queried (in parallel) once
+    # skills.sh is slow to answer, so a quick answer costs no search quota
     print("  → Checking skills.sh...", end=" ")
-    skills = fetch_from_skills_sh()
+    skills_sh_result = _start_daemon(fetch_from_skills_sh)
+    github_result = None
+    try:
+        skills = skills_sh_result.get(timeout=GITHUB_HEDGE_DELAY)
+    except queue.Empty:
+        github_result = _start_daemon(fetch_from_github)
+        skills = skills_sh_result.get()
     if skills:
         print(f"found {len(skills)} skills")
         return skills
@@ -199,20 +290,14 @@ def fetch_trending_skills():
 
     # Try GitHub API
     print("  → Checking GitHub...", end=" ")
-    skills = fetch_from_github()
+    skills = github_result.get() if github_result else fetch_from_github()
     if skills:
         print(f"found {len(skills)} repos")
-        # Merge with curated list
-        combined = skills + CURATED_SKILLS
-        # Deduplicate
-        seen = set()
-        unique = []
-        for s in combined:
-            if s["skill_id"] not in seen:
-                seen.add(s["skill_id"])
-                unique.append(s)
-        unique.sort(key=lambda x: x["installs"], reverse=True)
-        return unique
+        # Merge with curated list, keeping the first entry per skill_id
+        by_id = {}
+        for s in chain(skills, CURATED_SKILLS):
+            by_id.setdefault(s["skill_id"], s)
+        return sorted(by_id.values(), key=lambda x: x["installs"], reverse=True)
     print("rate limited or unavailable")
 
     # Use curated fallback
@@ -232,11 +317,12 @@ def get_installed_skills():
 
 def categorize_skill(skill_name):
     """Categorize a skill based on its name"""
-    name_lower = skill_name.lower()
-    categories = []
-    for cat, keywords in SKILL_CATEGORIES.items():
-        if any(kw in name_lower for kw in keywords):
-            categories.append(cat)
+    matched = set()
+    for kw in set(_CAT_RE.findall(skill_name.lower())):
+        for implied in _CAT_KW_IMPLIES[kw]:
+            matched.update(_KW_TO_CATS[implied])
+    # Keep SKILL_CATEGORIES order so output is stable
+    categories = [cat for cat in SKILL_CATEGORIES if cat in matched]
     return categories if categories else ["general"]
 
 
@@ -247,23 +333,27 @@ def get_usage_categories():
 
     if telemetry_file.exists():
         try:
-            with open(telemetry_file) as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            data = json.loads(line)
-                            skill = data.get("skill", "")
-                            # Map skills to categories
-                            if skill in ["plan", "scaffold"]:
-                                categories["react"] = categories.get("react", 0) + 1
-                            if skill in ["techdebt", "build-fix"]:
-                                categories["testing"] = categories.get("testing", 0) + 1
-                            if skill in ["commit"]:
-                                categories["devops"] = categories.get("devops", 0) + 1
-                            if skill in ["design-audit"]:
-                                categories["design"] = categories.get("design", 0) + 1
-                        except json.JSONDecodeError:
-                            continue
+            loads = orjson.loads if orjson else json.loads
+            with open(telemetry_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    # Most events (tool_use, session_start, ...) carry no skill
+                    if b'"skill"' not in line:
+                        continue
+
+                    # A compact (jq -c) line naming none of our skills needs no parse
+                    if b'"skill":"' in line and not any(needle in line for needle in _USAGE_NEEDLES):
+                        continue
+
+                    # The needle may sit in a nested field or string, so the
+                    # event's own skill decides
+                    try:
+                        skill = loads(line).get("skill", "")
+                    except (ValueError, AttributeError):
+                        continue
+                    if not isinstance(skill, str):
+                        continue
+                    for cat in USAGE_SKILL_CATEGORIES.get(skill, []):
+                        categories[cat] = categories.get(cat, 0) + 1
         except Exception:
             pass
 
@@ -294,7 +384,6 @@ def filter_relevant_skills(skills, installed, user_categories):
                 relevance_score += 0.5
 
         # Boost by popularity (log scale)
-        import math
         popularity_boost = math.log10(max(skill["installs"], 1)) / 5
 
         skill["relevance"] = relevance_score + popularity_boost
@@ -316,8 +405,11 @@ def save_discovery_cache(skills):
         "skills": skills
     }
 
-    with open(cache_file, "w") as f:
-        json.dump(data, f, indent=2)
+    if orjson:
+        cache_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(cache_file, "w") as f:
+            json.dump(data, f, indent=2)
 
     return cache_file
 
@@ -326,6 +418,8 @@ def load_discovery_cache():
     """Load cached discovery data"""
     cache_file = DISCOVERY_CACHE / "trending.json"
     if cache_file.exists():
+        if orjson:
+            return orjson.loads(cache_file.read_bytes())
         with open(cache_file) as f:
             return json.load(f)
     return None
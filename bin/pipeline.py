@@ -12,15 +12,25 @@ Usage:
 
 import os
 import sys
+import copy
+import functools
 import json
 import yaml
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
 DARWIN_DIR = Path.home() / ".claude" / "darwin"
 PIPELINES_DIR = DARWIN_DIR / "pipelines"
 SKILLS_DIR = DARWIN_DIR / "skills"
+CACHE_DIR = DARWIN_DIR / "cache"
+PIPELINE_CACHE_DIR = CACHE_DIR / "pipelines"
 
 # Built-in pipeline definitions
 BUILTIN_PIPELINES = {
@@ -32,19 +42,22 @@ BUILTIN_PIPELINES = {
                 "skill": "techdebt",
                 "name": "Find Technical Debt",
                 "args": "",
-                "pass_output": True
+                "pass_output": True,
+                "depends_on": []
             },
             {
                 "skill": "design-audit",
                 "name": "Accessibility Review",
                 "args": "",
-                "pass_output": True
+                "pass_output": True,
+                "depends_on": []
             },
             {
                 "skill": "review-plan",
                 "name": "Architecture Review",
                 "args": "",
-                "synthesize": True
+                "synthesize": True,
+                "depends_on": ["techdebt", "design-audit"]
             }
         ],
         "synthesis_prompt": "Combine findings from tech debt analysis, accessibility review, and architecture review into a prioritized action plan."
@@ -152,25 +165,81 @@ BUILTIN_PIPELINES = {
     }
 }
 
+# Built-in stage lists are static, so their "Stages:" lines are formatted once
+_BUILTIN_STAGE_PREVIEWS = {
+    name: " → ".join(s["skill"] for s in pipeline["stages"])
+    for name, pipeline in BUILTIN_PIPELINES.items()
+}
+
+
+# Parsed YAML keyed by path; entries are reused while (mtime_ns, size) match
+_YAML_CACHE = OrderedDict()  # str(path) -> (mtime_ns, size, data)
+_YAML_CACHE_MAX = 100
+
 
 def load_yaml(path: Path) -> dict:
     """Load YAML file safely."""
-    if not path.exists():
+    try:
+        st = os.stat(path)
+    except OSError:
         return {}
+
+    key = str(path)
+    cached = _YAML_CACHE.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
     try:
         with open(path, 'r') as f:
-            return yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_YamlLoader) or {}
     except:
         return {}
 
+    _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def load_pipeline_file(pipeline_file: Path) -> dict:
+    """Load a custom pipeline, preferring a JSON copy cached for its current mtime."""
+    try:
+        st = pipeline_file.stat()
+    except OSError:
+        return {}
+
+    cache_file = PIPELINE_CACHE_DIR / f"{pipeline_file.stem}.json"
+    try:
+        with open(cache_file, 'r') as f:
+            cached = json.load(f)
+        if cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+            return cached["pipeline"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    pipeline = load_yaml(pipeline_file)
+    if pipeline:
+        try:
+            PIPELINE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "pipeline": pipeline}, f)
+        except (OSError, TypeError, ValueError):
+            # Not JSON-serializable (e.g. YAML dates) or cache dir unwritable;
+            # a partially written cache file fails to parse and is ignored
+            pass
+    return pipeline
+
 
 def save_yaml(path: Path, data: dict):
     """Save YAML file."""
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, 'w') as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
 
 
+@functools.lru_cache(maxsize=None)
 def get_pipeline(name: str) -> Optional[dict]:
     """Get a pipeline by name."""
     # Check built-in first
@@ -180,46 +249,116 @@ def get_pipeline(name: str) -> Optional[dict]:
     # Check custom pipelines
     pipeline_file = PIPELINES_DIR / f"{name}.yaml"
     if pipeline_file.exists():
-        return load_yaml(pipeline_file)
+        return load_pipeline_file(pipeline_file)
 
     return None
 
 
+def _stage_id(stage: dict) -> str:
+    """Name other stages use to refer to this one in `depends_on`."""
+    return stage.get("id", stage.get("skill"))
+
+
+def _stage_depends(stage: dict) -> list:
+    """A stage's `depends_on` as a list; a single name may be given as a string."""
+    depends = stage["depends_on"]
+    if depends is None:
+        return []
+    if isinstance(depends, str):
+        return [depends]
+    if not isinstance(depends, list):
+        raise ValueError(f"stage '{_stage_id(stage)}' has a non-list depends_on: {depends!r}")
+    return depends
+
+
+def _topo_levels(stages: List[dict]) -> List[List[dict]]:
+    """Group stages into dependency levels using Kahn's algorithm.
+
+    A stage runs after every stage listed in its `depends_on` (matched by
+    `id`, or by skill name when no id is given). Stages without `depends_on`
+    run after the previous stage, so plain stage lists stay sequential.
+    Stages within one level are independent of each other.
+    """
+    index_by_id = {}
+    for i, stage in enumerate(stages):
+        index_by_id.setdefault(_stage_id(stage), []).append(i)
+
+    deps = []
+    for i, stage in enumerate(stages):
+        if "depends_on" in stage:
+            stage_deps = set()
+            for ref in _stage_depends(stage):
+                matches = index_by_id.get(ref, [])
+                if len(matches) != 1:
+                    problem = "ambiguous" if matches else "unknown"
+                    raise ValueError(f"stage '{_stage_id(stage)}' depends on {problem} stage '{ref}'")
+                stage_deps.add(matches[0])
+        else:
+            stage_deps = {i - 1} if i else set()
+        deps.append(stage_deps)
+
+    dependents = [[] for _ in stages]
+    in_degree = [len(stage_deps) for stage_deps in deps]
+    for i, stage_deps in enumerate(deps):
+        for dep in stage_deps:
+            dependents[dep].append(i)
+
+    levels = []
+    placed = 0
+    ready = [i for i, degree in enumerate(in_degree) if degree == 0]
+    while ready:
+        levels.append([stages[i] for i in ready])
+        placed += len(ready)
+        next_ready = []
+        for i in ready:
+            for dependent in dependents[i]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    next_ready.append(dependent)
+        ready = sorted(next_ready)
+
+    if placed != len(stages):
+        raise ValueError("pipeline stages contain a dependency cycle")
+    return levels
+
+
 def list_pipelines():
     """List all available pipelines."""
-    print("═══════════════════════════════════════════════════")
-    print("DARWIN SKILL PIPELINES")
-    print("═══════════════════════════════════════════════════")
-    print()
-
-    print("BUILT-IN PIPELINES")
-    print("───────────────────────────────────────────────────")
+    out = []
+    out.append("═══════════════════════════════════════════════════")
+    out.append("DARWIN SKILL PIPELINES")
+    out.append("═══════════════════════════════════════════════════")
+    out.append("")
+
+    out.append("BUILT-IN PIPELINES")
+    out.append("───────────────────────────────────────────────────")
     for name, pipeline in BUILTIN_PIPELINES.items():
-        stages = " → ".join(s["skill"] for s in pipeline["stages"])
-        print(f"  {name}")
-        print(f"    {pipeline['description']}")
-        print(f"    Stages: {stages}")
-        print()
+        out.append(f"  {name}")
+        out.append(f"    {pipeline['description']}")
+        out.append(f"    Stages: {_BUILTIN_STAGE_PREVIEWS[name]}")
+        out.append("")
 
     # Check for custom pipelines
     if PIPELINES_DIR.exists():
-        custom = list(PIPELINES_DIR.glob("*.yaml"))
+        with os.scandir(PIPELINES_DIR) as it:
+            custom = [Path(e.path) for e in it if e.name.endswith(".yaml")]
         if custom:
-            print("CUSTOM PIPELINES")
-            print("───────────────────────────────────────────────────")
+            out.append("CUSTOM PIPELINES")
+            out.append("───────────────────────────────────────────────────")
             for pipeline_file in custom:
-                pipeline = load_yaml(pipeline_file)
+                pipeline = load_pipeline_file(pipeline_file)
                 name = pipeline_file.stem
                 desc = pipeline.get("description", "No description")
                 stages = " → ".join(s["skill"] for s in pipeline.get("stages", []))
-                print(f"  {name}")
-                print(f"    {desc}")
-                print(f"    Stages: {stages}")
-                print()
+                out.append(f"  {name}")
+                out.append(f"    {desc}")
+                out.append(f"    Stages: {stages}")
+                out.append("")
 
-    print("═══════════════════════════════════════════════════")
-    print("Run: python pipeline.py run <name> [args]")
-    print("═══════════════════════════════════════════════════")
+    out.append("═══════════════════════════════════════════════════")
+    out.append("Run: python pipeline.py run <name> [args]")
+    out.append("═══════════════════════════════════════════════════")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def show_pipeline(name: str):
@@ -236,9 +375,17 @@ def show_pipeline(name: str):
     print(f"Description: {pipeline.get('description', 'N/A')}")
     print()
 
+    try:
+        levels = _topo_levels(pipeline.get("stages", []))
+    except ValueError as e:
+        print(f"Invalid pipeline {name}: {e}")
+        return
+
+    # Numbered in execution order, matching `run` and the generated prompt
     print("STAGES")
     print("───────────────────────────────────────────────────")
-    for i, stage in enumerate(pipeline.get("stages", []), 1):
+    stages = [stage for level in levels for stage in level]
+    for i, stage in enumerate(stages, 1):
         skill = stage.get("skill")
         stage_name = stage.get("name", skill)
         args = stage.get("args", "")
@@ -251,6 +398,8 @@ def show_pipeline(name: str):
             flags.append("★ synthesis point")
         if stage.get("fail_on"):
             flags.append(f"✗ fails on: {stage['fail_on']}")
+        if "depends_on" in stage:
+            flags.append(f"↳ after: {', '.join(map(str, _stage_depends(stage))) or 'start'}")
 
         print(f"  {i}. {stage_name}")
         print(f"     Skill: /{skill}")
@@ -277,58 +426,78 @@ def generate_pipeline_prompt(name: str, args: str = "") -> str:
 
     stages = pipeline.get("stages", [])
     synthesis = pipeline.get("synthesis_prompt", "")
+    try:
+        levels = _topo_levels(stages)
+    except ValueError as e:
+        return f"Invalid pipeline {name}: {e}"
+    parallel = any(len(level) > 1 for level in levels)
+
+    if parallel:
+        intro = ("Execute these skills level by level. Stages within a level are independent "
+                 "and can run in parallel; pass their combined output to the next level:")
+    else:
+        intro = "Execute these skills in sequence, passing context between them:"
 
-    prompt = f"""# Execute Pipeline: {name}
+    parts = [f"""# Execute Pipeline: {name}
 
 {pipeline.get('description', '')}
 
 ## Pipeline Stages
 
-Execute these skills in sequence, passing context between them:
+{intro}
 
-"""
+"""]
+    checklist = []
 
-    for i, stage in enumerate(stages, 1):
-        skill = stage.get("skill")
-        stage_name = stage.get("name", skill)
-        stage_args = stage.get("args", "").replace("$INPUT", args)
+    for level_num, level in enumerate(levels, 1):
+        if len(level) > 1:
+            parts.append(f"### Stage level {level_num} (run in parallel)\n\n")
+            heading = "####"
+        else:
+            heading = "###"
+
+        for stage in level:
+            skill = stage.get("skill")
+            stage_name = stage.get("name", skill)
+            stage_args = stage.get("args", "").replace("$INPUT", args)
+            stage_num = len(checklist) + 1
 
-        prompt += f"""### Stage {i}: {stage_name}
+            parts.append(f"""{heading} Stage {stage_num}: {stage_name}
 
 Run: `/{skill}` {stage_args}
 
-"""
-        if stage.get("pass_output"):
-            prompt += "**Important:** Capture the output and pass it to the next stage.\n\n"
-        if stage.get("confirm"):
-            prompt += "**Important:** Wait for user confirmation before proceeding.\n\n"
-        if stage.get("fail_on"):
-            prompt += f"**Important:** Stop pipeline if severity is {stage['fail_on']}.\n\n"
+""")
+            if stage.get("pass_output"):
+                parts.append("**Important:** Capture the output and pass it to the next stage.\n\n")
+            if stage.get("confirm"):
+                parts.append("**Important:** Wait for user confirmation before proceeding.\n\n")
+            if stage.get("fail_on"):
+                parts.append(f"**Important:** Stop pipeline if severity is {stage['fail_on']}.\n\n")
+            checklist.append(f"- [ ] Stage {stage_num}: {stage.get('name', stage['skill'])}\n")
 
     if synthesis:
-        prompt += f"""## Synthesis
+        parts.append(f"""## Synthesis
 
 After all stages complete:
 
 {synthesis}
 
 Provide a unified summary combining insights from all stages.
-"""
+""")
 
-    prompt += """
+    parts.append("""
 ## Execution Checklist
 
 Copy and track progress:
 ```
 Pipeline Progress:
-"""
-    for i, stage in enumerate(stages, 1):
-        prompt += f"- [ ] Stage {i}: {stage.get('name', stage['skill'])}\n"
+""")
+    parts.extend(checklist)
     if synthesis:
-        prompt += "- [ ] Synthesis: Combine results\n"
-    prompt += "```\n"
+        parts.append("- [ ] Synthesis: Combine results\n")
+    parts.append("```\n")
 
-    return prompt
+    return "".join(parts)
 
 
 def run_pipeline(name: str, args: str = ""):
@@ -346,14 +515,23 @@ def run_pipeline(name: str, args: str = ""):
     print(f"Description: {pipeline.get('description', '')}")
     print()
 
-    stages = pipeline.get("stages", [])
+    try:
+        levels = _topo_levels(pipeline.get("stages", []))
+    except ValueError as e:
+        print(f"Invalid pipeline {name}: {e}")
+        return
+
     print("EXECUTION PLAN")
     print("───────────────────────────────────────────────────")
-    for i, stage in enumerate(stages, 1):
-        skill = stage.get("skill")
-        stage_name = stage.get("name", skill)
-        confirm = " [confirm]" if stage.get("confirm") else ""
-        print(f"  {i}. /{skill}: {stage_name}{confirm}")
+    i = 0
+    for level in levels:
+        for stage in level:
+            i += 1
+            skill = stage.get("skill")
+            stage_name = stage.get("name", skill)
+            confirm = " [confirm]" if stage.get("confirm") else ""
+            parallel = " [parallel]" if len(level) > 1 else ""
+            print(f"  {i}. /{skill}: {stage_name}{confirm}{parallel}")
     print()
 
     if pipeline.get("synthesis_prompt"):
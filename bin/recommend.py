@@ -7,21 +7,50 @@ Usage:
   python recommend.py              # Show recommendations
   python recommend.py --gaps       # Show only detected gaps
   python recommend.py --external   # Include skills.sh recommendations
+  python recommend.py --refresh    # Re-read every telemetry session, ignoring cached counts
 """
 
-import os
-import sys
+import functools
 import json
+import mmap
+import os
+import re
 import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 DARWIN_DIR = Path.home() / ".claude" / "darwin"
 TELEMETRY_DIR = DARWIN_DIR / "telemetry"
 SKILLS_DIR = DARWIN_DIR / "skills"
 CACHE_DIR = DARWIN_DIR / "cache"
+# Per-session skill counts, reused while a session's mtime and size match
+SESSIONS_AGG_FILE = CACHE_DIR / "sessions_agg.json"
+
+# Matches conventional commit subjects
+_CONV_RE = re.compile(r'(feat|fix|refactor|docs|chore|test|style|perf)(\(.+\))?:')
+
+# Dependency names that identify a stack tag
+_DEP_TO_STACK = {
+    "react": "react",
+    "react-native": "react",
+    "next": "nextjs",
+    "expo": "expo",
+    "typescript": "typescript",
+    "tailwindcss": "tailwind",
+    "tailwind": "tailwind",
+    "zustand": "zustand",
+    "three": "three",
+}
 
 # Skill gap detection patterns
 PATTERNS = {
@@ -95,39 +124,86 @@ def load_json(path: Path) -> dict:
     if not path.exists():
         return {}
     try:
-        with open(path, 'r') as f:
-            return json.load(f)
+        data = path.read_bytes()
+        return orjson.loads(data) if orjson else json.loads(data)
     except:
         return {}
 
 
+def _inside_git_repo() -> bool:
+    """Check for a work tree without reading history; .git is tried before forking git."""
+    cwd = Path.cwd()
+    if any((d / ".git").exists() for d in (cwd, *cwd.parents)):
+        return True
+    # GIT_DIR and similar setups have no .git entry to find
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--is-inside-work-tree"],
+            capture_output=True, timeout=2, stdin=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0
+
+
 def get_git_stats(days: int = 7) -> Dict:
     """Get git commit statistics for the last N days."""
     stats = {"commits": 0, "commit_messages": [], "files_changed": set()}
 
+    if not _inside_git_repo():
+        return stats
+
     try:
-        # Get recent commits
+        # Get recent commits as "<hash>|<subject>" in one bounded call
         since_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
         result = subprocess.run(
-            ["git", "log", f"--since={since_date}", "--oneline"],
-            capture_output=True, text=True, timeout=10
+            ["git", "--no-pager", "log", "--no-color", f"--since={since_date}",
+             "--pretty=format:%H|%s", "-n", "200"],
+            capture_output=True, text=True, timeout=10, stdin=subprocess.DEVNULL
         )
         if result.returncode == 0:
-            commits = result.stdout.strip().split('\n')
-            stats["commits"] = len([c for c in commits if c])
-            stats["commit_messages"] = commits[:20]  # Last 20
+            subjects = [line.partition("|")[2] for line in result.stdout.split("\n") if line]
+            stats["commits"] = len(subjects)
+            stats["commit_messages"] = subjects[:20]  # Last 20
 
             # Check for conventional commits
-            conventional_pattern = r'^[a-f0-9]+ (feat|fix|refactor|docs|chore|test|style|perf)(\(.+\))?:'
-            stats["conventional_commits"] = sum(
-                1 for c in commits if re.match(conventional_pattern, c)
-            )
+            stats["conventional_commits"] = sum(1 for c in subjects if _CONV_RE.match(c))
     except:
         pass
 
     return stats
 
 
+def _iter_recent_logs(root: str, cutoff: float):
+    """Yield *.log files modified after cutoff, in the order find(1) visits them."""
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_recent_logs(entry.path, cutoff)
+            elif entry.name.endswith(".log") and entry.stat(follow_symlinks=False).st_mtime > cutoff:
+                yield entry.path
+        except OSError:
+            continue
+
+
+def _count_ts_error_logs(root: str = ".", limit: int = 5) -> int:
+    """Count recent log files (checking at most `limit`) that contain TypeScript errors."""
+    count = 0
+    for path in islice(_iter_recent_logs(root, time.time() - 86400), limit):
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"error TS") != -1:
+                    count += 1
+        except (OSError, ValueError):  # unreadable or empty file
+            continue
+    return count
+
+
 def get_build_stats() -> Dict:
     """Detect build failures from recent activity."""
     stats = {"failures": 0, "last_failure": None}
@@ -135,19 +211,15 @@ def get_build_stats() -> Dict:
     # Check for common build error patterns in recent terminal history
     # This is a heuristic - in production would use proper telemetry
     try:
-        # Check for TypeScript errors
-        result = subprocess.run(
-            ["bash", "-c", "find . -name '*.log' -mtime -1 2>/dev/null | head -5 | xargs grep -l 'error TS' 2>/dev/null | wc -l"],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0:
-            stats["failures"] += int(result.stdout.strip() or 0)
+        # Check for TypeScript errors in logs from the last day
+        stats["failures"] += _count_ts_error_logs()
     except:
         pass
 
     return stats
 
 
+@functools.lru_cache(maxsize=None)
 def get_skill_usage() -> Dict[str, int]:
     """Get skill usage counts from telemetry."""
     usage = {}
@@ -168,23 +240,66 @@ def get_skill_usage() -> Dict[str, int]:
         for skill, data in skills_data.items():
             usage[skill] = data.get("invocations", 0) if isinstance(data, dict) else data
 
-    # Also check session files
+    # Also check session files; aggregate.sh builds aggregates.json from
+    # skills.jsonl only, so sessions are never already counted there
     sessions_dir = TELEMETRY_DIR / "sessions"
     if sessions_dir.exists():
-        for session_file in sessions_dir.glob("*.json"):
-            session = load_json(session_file)
-            for event in session.get("events", []):
-                skill = event.get("skill")
-                if skill:
-                    usage[skill] = usage.get(skill, 0) + 1
+        for counts in _session_skill_counts(sessions_dir):
+            for skill, count in counts.items():
+                usage[skill] = usage.get(skill, 0) + count
 
     return usage
 
 
+def _session_skill_counts(sessions_dir: Path) -> List[Dict[str, int]]:
+    """Per-session skill counts, re-parsing only sessions whose mtime or size changed."""
+    agg_file = SESSIONS_AGG_FILE
+    cached = load_json(agg_file)
+    if not isinstance(cached, dict):
+        cached = {}
+    fresh = {}
+    results = []
+
+    with os.scandir(sessions_dir) as it:
+        session_entries = [e for e in it if e.name.endswith(".json")]
+
+    for session_entry in session_entries:
+        key = session_entry.path
+        try:
+            st = session_entry.stat()
+        except OSError:
+            continue
+        entry = cached.get(key)
+        if not (isinstance(entry, dict) and isinstance(entry.get("counts"), dict)
+                and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size):
+            counts = {}
+            session = load_json(Path(key))
+            for event in session.get("events", []):
+                skill = event.get("skill")
+                if skill:
+                    counts[skill] = counts.get(skill, 0) + 1
+            entry = {"mtime": st.st_mtime_ns, "size": st.st_size, "counts": counts}
+        fresh[key] = entry
+        results.append(entry["counts"])
+
+    # Rewrite only when a session was added, changed, or removed; the temp
+    # file keeps an interrupted write from leaving a truncated cache
+    if fresh != cached:
+        tmp_file = agg_file.with_name(agg_file.name + ".tmp")
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump(fresh, f)
+            os.replace(tmp_file, agg_file)
+        except OSError:
+            pass
+
+    return results
+
+
+@functools.lru_cache(maxsize=None)
 def detect_stack() -> List[str]:
     """Detect the user's tech stack from project files."""
-    stack = []
-
     # Check package.json
     pkg_paths = [
         Path.cwd() / "package.json",
@@ -192,36 +307,27 @@ def detect_stack() -> List[str]:
         Path.home() / "eido-editions" / "package.json"
     ]
 
-    for pkg_path in pkg_paths:
-        if pkg_path.exists():
-            pkg = load_json(pkg_path)
-            deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-
-            if "react" in deps or "react-native" in deps:
-                stack.append("react")
-            if "next" in deps:
-                stack.append("nextjs")
-            if "expo" in deps:
-                stack.append("expo")
-            if "typescript" in deps:
-                stack.append("typescript")
-            if "tailwindcss" in deps or "tailwind" in deps:
-                stack.append("tailwind")
-            if "zustand" in deps:
-                stack.append("zustand")
-            if "three" in deps:
-                stack.append("three")
-
-    return list(set(stack))
+    # The reads are independent, so overlap them; load_json treats a
+    # missing file as empty.
+    with ThreadPoolExecutor(max_workers=len(pkg_paths)) as ex:
+        pkgs = list(ex.map(load_json, pkg_paths))
 
+    # Intersect key views directly; no merged copy of the deps is needed
+    stack = set()
+    for pkg in pkgs:
+        for section in ("dependencies", "devDependencies"):
+            for dep in _DEP_TO_STACK.keys() & pkg.get(section, {}).keys():
+                stack.add(_DEP_TO_STACK[dep])
+    return list(stack)
 
+
+@functools.lru_cache(maxsize=None)
 def get_installed_skills() -> List[str]:
     """Get list of installed Darwin skills."""
-    skills = []
-    if SKILLS_DIR.exists():
-        for skill_file in SKILLS_DIR.glob("*.yaml"):
-            skills.append(skill_file.stem)
-    return skills
+    if not SKILLS_DIR.exists():
+        return []
+    with os.scandir(SKILLS_DIR) as it:
+        return [e.name[:-5] for e in it if e.name.endswith(".yaml")]
 
 
 def detect_gaps() -> List[Dict]:
@@ -333,10 +439,11 @@ def get_usage_tips(skill_usage: Dict[str, int], installed: List[str]) -> List[Di
 
 def print_recommendations(include_external: bool = True):
     """Print all recommendations."""
-    print("═══════════════════════════════════════════════════")
-    print("DARWIN RECOMMENDATIONS")
-    print("═══════════════════════════════════════════════════")
-    print()
+    out = []
+    out.append("═══════════════════════════════════════════════════")
+    out.append("DARWIN RECOMMENDATIONS")
+    out.append("═══════════════════════════════════════════════════")
+    out.append("")
 
     # Gather data
     gaps = detect_gaps()
@@ -347,67 +454,82 @@ def print_recommendations(include_external: bool = True):
 
     # Print detected stack
     if stack:
-        print(f"DETECTED STACK: {', '.join(stack)}")
-        print()
+        out.append(f"DETECTED STACK: {', '.join(stack)}")
+        out.append("")
 
     # Print skill gaps
     if gaps:
-        print("SKILL GAPS")
-        print("───────────────────────────────────────────────────")
+        out.append("SKILL GAPS")
+        out.append("───────────────────────────────────────────────────")
         for gap in gaps:
             icon = "💡" if gap["installed"] else "📦"
             priority_marker = "❗" if gap["priority"] == "high" else ""
-            print(f" {icon} {gap['message']} {priority_marker}")
+            out.append(f" {icon} {gap['message']} {priority_marker}")
             if gap["installed"]:
-                print(f"    → Use /{gap['skill']} - {gap['benefit']}")
+                out.append(f"    → Use /{gap['skill']} - {gap['benefit']}")
             else:
-                print(f"    → Install /{gap['skill']} - {gap['benefit']}")
-            print()
+                out.append(f"    → Install /{gap['skill']} - {gap['benefit']}")
+            out.append("")
     else:
-        print("✓ No skill gaps detected")
-        print()
+        out.append("✓ No skill gaps detected")
+        out.append("")
 
     # Print usage tips
     if tips:
-        print("USAGE TIPS")
-        print("───────────────────────────────────────────────────")
+        out.append("USAGE TIPS")
+        out.append("───────────────────────────────────────────────────")
         for tip in tips[:5]:  # Top 5
-            print(f" 💡 {tip['message']}")
-            print(f"    → {tip['suggestion']}")
-            print()
+            out.append(f" 💡 {tip['message']}")
+            out.append(f"    → {tip['suggestion']}")
+            out.append("")
 
     # Print external recommendations
     if include_external:
         external = get_external_recommendations(stack, installed)
         if external:
-            print("RECOMMENDED FROM SKILLS.SH")
-            print("───────────────────────────────────────────────────")
+            out.append("RECOMMENDED FROM SKILLS.SH")
+            out.append("───────────────────────────────────────────────────")
             for rec in external[:5]:  # Top 5
-                print(f" 📥 {rec['name']} ({rec['installs']} installs)")
-                print(f"    Reason: {rec['reason']}")
-                print(f"    Stack match: {rec['stack_match']}")
-                print(f"    Install: {rec['install_cmd']}")
-                print()
+                out.append(f" 📥 {rec['name']} ({rec['installs']} installs)")
+                out.append(f"    Reason: {rec['reason']}")
+                out.append(f"    Stack match: {rec['stack_match']}")
+                out.append(f"    Install: {rec['install_cmd']}")
+                out.append("")
 
     # Print skill fitness summary
-    print("SKILL HEALTH SUMMARY")
-    print("───────────────────────────────────────────────────")
-    total_usage = sum(skill_usage.values())
-    active_skills = len([s for s, u in skill_usage.items() if u > 0])
-    print(f" Total invocations: {total_usage}")
-    print(f" Active skills: {active_skills}/{len(installed)}")
-    print(f" Most used: {max(skill_usage.items(), key=lambda x: x[1])[0] if skill_usage else 'N/A'}")
-    print()
-
-    print("═══════════════════════════════════════════════════")
-    print("Run '/darwin status' for detailed fitness scores")
-    print("Run '/darwin sync' to fetch trending skills")
-    print("═══════════════════════════════════════════════════")
+    out.append("SKILL HEALTH SUMMARY")
+    out.append("───────────────────────────────────────────────────")
+    total_usage = 0
+    active_skills = 0
+    most_used, most_count = "N/A", None
+    for skill, usage in skill_usage.items():
+        total_usage += usage
+        if usage > 0:
+            active_skills += 1
+        if most_count is None or usage > most_count:
+            most_used, most_count = skill, usage
+    out.append(f" Total invocations: {total_usage}")
+    out.append(f" Active skills: {active_skills}/{len(installed)}")
+    out.append(f" Most used: {most_used}")
+    out.append("")
+
+    out.append("═══════════════════════════════════════════════════")
+    out.append("Run '/darwin status' for detailed fitness scores")
+    out.append("Run '/darwin sync' to fetch trending skills")
+    out.append("═══════════════════════════════════════════════════")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
     args = sys.argv[1:]
 
+    if "--refresh" in args:
+        # Drop the on-disk session counts so every session is re-read
+        try:
+            SESSIONS_AGG_FILE.unlink()
+        except FileNotFoundError:
+            pass
+
     if "--gaps" in args:
         gaps = detect_gaps()
         print(json.dumps(gaps, indent=2))
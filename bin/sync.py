@@ -6,25 +6,53 @@ Fetches trending skills, matches to user's stack, and manages external skill ins
 Usage:
   python sync.py                    # Show sync dashboard
   python sync.py trending           # Show trending skills
-  python sync.py install <name>     # Install external skill
+  python sync.py install <name>...  # Install external skill(s)
   python sync.py upgrade            # Check for skill upgrades
   python sync.py search <query>     # Search skills.sh
+  python sync.py refresh            # Drop cached skills.sh responses
 """
 
 import os
+import re
 import sys
 import json
-import subprocess
+import time
+import functools
+import shutil
+import hashlib
 import urllib.request
 import urllib.error
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DARWIN_DIR = Path.home() / ".claude" / "darwin"
 SKILLS_DIR = DARWIN_DIR / "skills"
 CACHE_DIR = DARWIN_DIR / "cache"
 EXTERNAL_SKILLS_DIR = Path.home() / ".claude" / "skills"
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+
+# Skill manifests (skill.json, or SKILL.md frontmatter) used to resolve dependencies
+MANIFEST_URL = "https://raw.githubusercontent.com/{owner}/{repo}/main/{file}"
+_MANIFEST_TTL = 24 * 3600
+# `depends:` in SKILL.md frontmatter: a [flow, list], a single name, or a block list
+_DEPENDS_RE = re.compile(
+    r'^depends:[ \t]*(?:\[([^\]\n]*)\]|([^\s\[#][^\n]*)|\n((?:[ \t]*-[ \t]*\S.*(?:\n|$))+))', re.M)
+
+# Banner rules shared by the dashboard and trending views
+_SEP_DOUBLE = "═" * 51
+_SEP_SINGLE = "─" * 51
+
+# Row templates for the dashboard and trending views
+_HOT_LINE = " ↑ %-40s +%s installs"
+_SKILL_LINE = " %s %-40s %7s installs"
+_DESC_LINE = "   └─ %s"
+_FIRE_LINE = " 🔥 %-40s +%s"
+_RANK_LINE = " %2d. %-40s %7s"
 
 # Skills.sh curated list (since API may not be public)
 # In production, this would fetch from skills.sh API
@@ -68,14 +96,40 @@ STACK_CATEGORIES = {
     "three": ["design"],
 }
 
+# Trending entries by name, and each stack's (skill name, skill info) candidates in order
+_TRENDING_BY_NAME = {s["name"]: s for s in CURATED_SKILLS["trending"]}
+_RECS_BY_STACK = {
+    tech: [(skill_name, _TRENDING_BY_NAME.get(
+                skill_name,
+                {"name": skill_name, "installs": 0, "category": category, "description": ""}))
+           for category in categories
+           for skill_name in CURATED_SKILLS["categories"].get(category, [])]
+    for tech, categories in STACK_CATEGORIES.items()
+}
+
+# Lowercased search fields, built once: (name, description, skill) and category -> (name, skills)
+_SEARCH_INDEX = [(s["name"].lower(), s.get("description", "").lower(), s) for s in CURATED_SKILLS["trending"]]
+_CATEGORY_LOWER = {c.lower(): (c, skills) for c, skills in CURATED_SKILLS["categories"].items()}
+
+# Dependency names detect_stack cares about, matched as JSON object keys
+_STACK_DEP_RE = re.compile(rb'"(react|react-native|next|expo|typescript|tailwindcss|zustand|three)"\s*:')
+_DEP_SECTION_RE = re.compile(rb'"(dependencies|devDependencies)"\s*:\s*\{')
+_JSON_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]')
+
+# External skill listings keyed by directory: path -> (mtime_ns, names)
+_EXTERNAL_LISTING = {}
+
+# Dashboard sections that only depend on CURATED_SKILLS, rendered on first use
+_STATIC_CACHE = {}
+
 
 def load_json(path: Path) -> dict:
     """Load JSON file safely."""
     if not path.exists():
         return {}
     try:
-        with open(path, 'r') as f:
-            return json.load(f)
+        data = path.read_bytes()
+        return orjson.loads(data) if orjson else json.loads(data)
     except:
         return {}
 
@@ -83,8 +137,121 @@ def load_json(path: Path) -> dict:
 def save_json(path: Path, data: dict):
     """Save JSON file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+    if orjson:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def http_get_cached(url: str, ttl: int = 300) -> str:
+    """GET a URL through an on-disk cache under CACHE_DIR/http.
+
+    Responses younger than `ttl` seconds are returned without a request.
+    Older ones are revalidated with If-None-Match / If-Modified-Since, and a
+    304 only renews them. A stale copy is returned when the network fails.
+    A 404 is remembered for `ttl` too, and re-raised without a request.
+    """
+    cache_file = HTTP_CACHE_DIR / f"{hashlib.blake2b(url.encode(), digest_size=16).hexdigest()}.json"
+    cached = load_json(cache_file)
+    if not isinstance(cached, dict):
+        cached = {}
+
+    now = time.time()
+    fresh = now - cached.get("fetched_at", 0) < ttl
+    if cached.get("status") == 404:
+        if fresh:
+            raise urllib.error.HTTPError(url, 404, "Not Found (cached)", None, None)
+        cached = {}
+    elif not isinstance(cached.get("body"), str):
+        cached = {}
+    elif fresh:
+        return cached["body"]
+
+    request = urllib.request.Request(url, headers={"User-Agent": "darwin-skills"})
+    if cached.get("etag"):
+        request.add_header("If-None-Match", cached["etag"])
+    if cached.get("last_modified"):
+        request.add_header("If-Modified-Since", cached["last_modified"])
+
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            entry = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": now,
+                "body": response.read().decode("utf-8"),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            try:
+                save_json(cache_file, {"status": 404, "fetched_at": now})
+            except OSError:
+                pass
+        if e.code != 304 or not cached:
+            raise
+        entry = {**cached, "fetched_at": now}
+    except (urllib.error.URLError, OSError):
+        if not cached:
+            raise
+        return cached["body"]
+
+    try:
+        save_json(cache_file, entry)
+    except OSError:
+        pass
+    return entry["body"]
+
+
+def _dep_names(buf: bytes) -> Optional[set]:
+    """Stack-relevant dependency names in package.json bytes, found without parsing.
+
+    Only top-level dependencies/devDependencies sections count; brace depth is
+    tracked from the start of the buffer, skipping over strings. Returns None
+    when the layout is not the plain one this scan understands (a repeated
+    section, a nested object inside one, or unbalanced braces), so the caller
+    can parse the file instead.
+    """
+    names = set()
+    sections = set()
+    depth = 0
+    section_start = None
+
+    for token in _JSON_TOKEN_RE.finditer(buf):
+        text = token.group()
+        if text == b"{":
+            depth += 1
+            # Dependency values are plain strings
+            if section_start is not None and depth > 2:
+                return None
+        elif text == b"}":
+            depth -= 1
+            if section_start is not None and depth == 1:
+                names.update(name.decode() for name in _STACK_DEP_RE.findall(buf, section_start, token.start()))
+                section_start = None
+        elif depth == 1 and section_start is None:
+            section = _DEP_SECTION_RE.match(buf, token.start())
+            if section:
+                if section.group(1) in sections:
+                    return None
+                sections.add(section.group(1))
+                section_start = section.end()
+
+    if depth != 0 or section_start is not None:
+        return None
+    return names
+
+
+def _stack_cache_key(paths: List[Path]) -> List[list]:
+    """[path, mtime_ns, size] for each existing path; changes whenever a file does."""
+    key = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        key.append([str(path), st.st_mtime_ns, st.st_size])
+    return key
 
 
 def detect_stack() -> List[str]:
@@ -97,10 +264,23 @@ def detect_stack() -> List[str]:
         Path.home() / "eido-editions" / "package.json"
     ]
 
+    # Reuse the last result while none of the package.json files changed
+    cache_file = CACHE_DIR / "stack.json"
+    key = _stack_cache_key(pkg_paths)
+    cached = load_json(cache_file)
+    if isinstance(cached, dict) and cached.get("key") == key and isinstance(cached.get("stack"), list):
+        return cached["stack"]
+
     for pkg_path in pkg_paths:
         if pkg_path.exists():
-            pkg = load_json(pkg_path)
-            deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
+            # Scan the dependency sections as bytes; parse only unusual layouts
+            try:
+                deps = _dep_names(pkg_path.read_bytes())
+            except OSError:
+                deps = set()
+            if deps is None:
+                pkg = load_json(pkg_path)
+                deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
 
             if "react" in deps or "react-native" in deps:
                 stack.append("react")
@@ -117,26 +297,42 @@ def detect_stack() -> List[str]:
             if "three" in deps:
                 stack.append("three")
 
-    return list(set(stack))
+    # Keep the first-seen order: cwd first, then the fallback projects
+    stack = list(dict.fromkeys(stack))
+    try:
+        save_json(cache_file, {"key": key, "stack": stack})
+    except OSError:
+        pass
+    return stack
 
 
 def get_installed_external() -> List[str]:
     """Get list of installed external skills."""
+    try:
+        mtime = EXTERNAL_SKILLS_DIR.stat().st_mtime_ns
+    except OSError:
+        return []
+
+    # Adding or removing a skill directory bumps the directory mtime
+    cached = _EXTERNAL_LISTING.get(EXTERNAL_SKILLS_DIR)
+    if cached and cached[0] == mtime:
+        return list(cached[1])
+
     installed = []
-    if EXTERNAL_SKILLS_DIR.exists():
-        for item in EXTERNAL_SKILLS_DIR.iterdir():
-            if item.is_dir() and (item / "SKILL.md").exists():
-                installed.append(item.name)
-    return installed
+    with os.scandir(EXTERNAL_SKILLS_DIR) as it:
+        for entry in it:
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, "SKILL.md")):
+                installed.append(entry.name)
+    _EXTERNAL_LISTING[EXTERNAL_SKILLS_DIR] = (mtime, installed)
+    return list(installed)
 
 
 def get_darwin_skills() -> List[str]:
     """Get list of Darwin-managed skills."""
-    skills = []
-    if SKILLS_DIR.exists():
-        for skill_file in SKILLS_DIR.glob("*.yaml"):
-            skills.append(skill_file.stem)
-    return skills
+    if not SKILLS_DIR.exists():
+        return []
+    with os.scandir(SKILLS_DIR) as it:
+        return [e.name[:-5] for e in it if e.name.endswith(".yaml")]
 
 
 def get_recommended_for_stack(stack: List[str]) -> List[Dict]:
@@ -145,36 +341,100 @@ def get_recommended_for_stack(stack: List[str]) -> List[Dict]:
     seen = set()
 
     for tech in stack:
-        categories = STACK_CATEGORIES.get(tech, [])
-        for category in categories:
-            category_skills = CURATED_SKILLS["categories"].get(category, [])
-            for skill_name in category_skills:
-                if skill_name not in seen:
-                    seen.add(skill_name)
-                    # Find full skill info
-                    skill_info = next(
-                        (s for s in CURATED_SKILLS["trending"] if s["name"] == skill_name),
-                        {"name": skill_name, "installs": 0, "category": category, "description": ""}
-                    )
-                    recommendations.append({
-                        **skill_info,
-                        "stack_match": tech
-                    })
+        for skill_name, skill_info in _RECS_BY_STACK.get(tech, []):
+            if skill_name not in seen:
+                seen.add(skill_name)
+                recommendations.append({
+                    **skill_info,
+                    "stack_match": tech
+                })
 
     # Sort by installs
     recommendations.sort(key=lambda x: x.get("installs", 0), reverse=True)
     return recommendations[:10]
 
 
-def install_skill(skill_name: str) -> bool:
-    """Install a skill from skills.sh."""
+def _skill_depends(skill_name: str) -> List[str]:
+    """Direct dependencies declared in a skill's skill.json, or else its SKILL.md frontmatter."""
+    parts = skill_name.split("/")
+    if len(parts) < 2:
+        return []
+    owner, repo = parts[0], parts[1]
+
+    try:
+        manifest = json.loads(http_get_cached(
+            MANIFEST_URL.format(owner=owner, repo=repo, file="skill.json"), ttl=_MANIFEST_TTL))
+        depends = manifest.get("depends") if isinstance(manifest, dict) else None
+        if not isinstance(depends, list):
+            return []
+        return [d for d in depends if isinstance(d, str)]
+    except (urllib.error.URLError, OSError, ValueError):
+        pass
+
+    try:
+        skill_md = http_get_cached(
+            MANIFEST_URL.format(owner=owner, repo=repo, file="SKILL.md"), ttl=_MANIFEST_TTL)
+    except (urllib.error.URLError, OSError, ValueError):
+        return []
+    skill_md = skill_md.replace("\r\n", "\n")
+    if not skill_md.startswith("---"):
+        return []
+    end = skill_md.find("\n---", 3)
+    match = _DEPENDS_RE.search(skill_md[3:end] if end != -1 else "")
+    if not match:
+        return []
+    if match.group(1) is not None:
+        items = match.group(1).split(",")
+    elif match.group(2) is not None:
+        items = [match.group(2)]
+    else:
+        items = [line.strip()[1:] for line in match.group(3).splitlines()]
+    return [item for item in (i.strip().strip("'\"") for i in items) if item]
+
+
+def resolve_dependencies(skill_name: str, graph: Optional[Dict[str, List[str]]] = None) -> List[str]:
+    """The skill and everything it depends on, dependencies first.
+
+    Each visited skill's direct dependencies are recorded in `graph` when one
+    is given. Raises ValueError if the dependencies form a cycle.
+    """
+    order = []
+    done = set()
+    visiting = []
+
+    def visit(name: str):
+        if name in done:
+            return
+        if name in visiting:
+            cycle = visiting[visiting.index(name):] + [name]
+            raise ValueError(f"dependency cycle: {' → '.join(cycle)}")
+        visiting.append(name)
+        depends = _skill_depends(name)
+        if graph is not None:
+            graph[name] = depends
+        for dep in depends:
+            visit(dep)
+        visiting.pop()
+        done.add(name)
+        order.append(name)
+
+    visit(skill_name)
+    return order
+
+
+def _install_one(skill_name: str) -> bool:
+    """Install a single skill from skills.sh, without resolving dependencies."""
+    # Imported here so the dashboard and search commands don't load it
+    import subprocess
+
     print(f"Installing {skill_name}...")
 
     try:
         # Use npx skills add
+        # Only stderr is reported, so stdout is discarded rather than buffered
         result = subprocess.run(
             ["npx", "skills", "add", skill_name],
-            capture_output=True, text=True, timeout=60
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60
         )
 
         if result.returncode == 0:
@@ -194,6 +454,67 @@ def install_skill(skill_name: str) -> bool:
         return False
 
 
+def install_skill(skill_name: str) -> bool:
+    """Install a skill from skills.sh, along with the skills it depends on."""
+    return skill_name in install_skills([skill_name])
+
+
+def install_skills(skill_names: List[str]) -> List[str]:
+    """Install skills and their dependencies with a single `npx skills add` call.
+
+    A skill whose dependencies form a cycle is reported and left out. If the
+    batched call fails, each skill is retried on its own, dependencies first,
+    so the ones that do install still get wrappers; a skill whose dependency
+    failed is skipped. Returns the installed names.
+    """
+    import subprocess
+
+    requested = skill_names
+    skill_names = []
+    graph = {}
+    for name in requested:
+        try:
+            skill_names.extend(resolve_dependencies(name, graph))
+        except ValueError as e:
+            print(f"  ✗ Cannot install {name}: {e}")
+    skill_names = list(dict.fromkeys(skill_names))
+
+    if not skill_names:
+        return []
+    if len(skill_names) == 1:
+        return skill_names if _install_one(skill_names[0]) else []
+
+    print(f"Installing {', '.join(skill_names)}...")
+
+    try:
+        result = subprocess.run(
+            ["npx", "skills", "add", *skill_names],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60 * len(skill_names)
+        )
+    except subprocess.TimeoutExpired:
+        print(f"  ✗ Installation timed out")
+        return []
+    except FileNotFoundError:
+        print(f"  ✗ npx not found. Install Node.js first.")
+        return []
+
+    if result.returncode != 0:
+        print(f"  ✗ Batched install failed, installing one at a time")
+        installed = []
+        for name in skill_names:
+            missing = [dep for dep in graph.get(name, []) if dep not in installed]
+            if missing:
+                print(f"  ✗ Skipping {name}: {', '.join(missing)} not installed")
+            elif _install_one(name):
+                installed.append(name)
+        return installed
+
+    print(f"  ✓ Installed {len(skill_names)} skills")
+    for skill_name in skill_names:
+        create_darwin_wrapper(skill_name)
+    return list(skill_names)
+
+
 def create_darwin_wrapper(skill_name: str):
     """Create a Darwin YAML wrapper for an external skill."""
     # Extract short name from owner/repo format
@@ -213,15 +534,17 @@ def create_darwin_wrapper(skill_name: str):
             "workflow": "v3",
             "validation": "v3"
         },
-        "installed_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "installed_at": "%04d-%02d-%02dT%02d:%02d:%02dZ" % time.gmtime()[:6],
         "fitness_history": []
     }
 
     wrapper_path = SKILLS_DIR / f"{short_name}.yaml"
 
+    # PyYAML is only needed when installing; prefer the libyaml dumper
     import yaml
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
     with open(wrapper_path, 'w') as f:
-        yaml.dump(wrapper, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(wrapper, f, Dumper=dumper, default_flow_style=False, sort_keys=False)
 
     print(f"  ✓ Darwin tracking enabled for /{short_name}")
 
@@ -241,90 +564,112 @@ def search_skills(query: str) -> List[Dict]:
     results = []
     query_lower = query.lower()
 
-    for skill in CURATED_SKILLS["trending"]:
-        if query_lower in skill["name"].lower() or query_lower in skill.get("description", "").lower():
+    for name_lower, desc_lower, skill in _SEARCH_INDEX:
+        if query_lower in name_lower or query_lower in desc_lower:
             results.append(skill)
 
-    for category, skills in CURATED_SKILLS["categories"].items():
-        if query_lower in category:
+    seen = {r["name"] for r in results}
+    for category_lower, (category, skills) in _CATEGORY_LOWER.items():
+        if query_lower in category_lower:
             for skill_name in skills:
-                if not any(r["name"] == skill_name for r in results):
+                if skill_name not in seen:
+                    seen.add(skill_name)
                     results.append({"name": skill_name, "category": category, "installs": 0})
 
     return results[:10]
 
 
-def print_dashboard():
-    """Print the sync dashboard."""
-    print("═══════════════════════════════════════════════════")
-    print("DARWIN SKILLS.SH SYNC")
-    print("═══════════════════════════════════════════════════")
-    print()
-
-    # Detect stack
-    stack = detect_stack()
-    installed_external = get_installed_external()
-    darwin_skills = get_darwin_skills()
+def _render_static_trending_block() -> str:
+    """TRENDING (24h) section; it only depends on CURATED_SKILLS, so it is rendered once."""
+    block = _STATIC_CACHE.get("trending")
+    if block is None:
+        lines = ["TRENDING (24h)", _SEP_SINGLE]
+        for skill in CURATED_SKILLS["hot_24h"][:5]:
+            lines.append(_HOT_LINE % (skill["name"], format(skill["delta"], ",")))
+        lines.append("")
+        block = _STATIC_CACHE["trending"] = "\n".join(lines)
+    return block
 
-    print(f"YOUR STACK: {', '.join(stack) if stack else 'Not detected'}")
-    print(f"DARWIN SKILLS: {len(darwin_skills)}")
-    print(f"EXTERNAL SKILLS: {len(installed_external)}")
-    print()
 
-    # Trending
-    print("TRENDING (24h)")
-    print("───────────────────────────────────────────────────")
-    for skill in CURATED_SKILLS["hot_24h"][:5]:
-        print(f" ↑ {skill['name']:40} +{skill['delta']:,} installs")
-    print()
+@functools.lru_cache(maxsize=8)
+def _render_dynamic_block(installed_external: frozenset, stack: tuple) -> str:
+    """Recommended and top-skill sections, which carry install markers."""
+    out = []
 
     # Recommended for stack
     if stack:
-        print("RECOMMENDED FOR YOUR STACK")
-        print("───────────────────────────────────────────────────")
-        recommendations = get_recommended_for_stack(stack)
+        out.append("RECOMMENDED FOR YOUR STACK")
+        out.append(_SEP_SINGLE)
+        recommendations = get_recommended_for_stack(list(stack))
         for rec in recommendations[:5]:
-            installed_marker = "✓" if rec["name"].split("/")[-1] in installed_external else " "
-            print(f" {installed_marker} {rec['name']:40} {rec.get('installs', 0):>7,} installs")
-            print(f"   └─ {rec.get('description', 'No description')[:50]}")
-        print()
+            installed_marker = "✓" if rec["name"].rsplit("/", 1)[-1] in installed_external else " "
+            out.append(_SKILL_LINE % (installed_marker, rec["name"], format(rec.get("installs", 0), ",")))
+            out.append(_DESC_LINE % rec.get("description", "No description")[:50])
+        out.append("")
 
     # Top overall
-    print("TOP SKILLS (ALL TIME)")
-    print("───────────────────────────────────────────────────")
-    for skill in CURATED_SKILLS["trending"][:5]:
-        installed_marker = "✓" if skill["name"].split("/")[-1] in installed_external else " "
-        print(f" {installed_marker} {skill['name']:40} {skill['installs']:>7,} installs")
-    print()
+    out.append("TOP SKILLS (ALL TIME)")
+    out.append(_SEP_SINGLE)
+    trending_short = [(s, s["name"].rsplit("/", 1)[-1]) for s in CURATED_SKILLS["trending"][:5]]
+    for skill, short_name in trending_short:
+        installed_marker = "✓" if short_name in installed_external else " "
+        out.append(_SKILL_LINE % (installed_marker, skill["name"], format(skill["installs"], ",")))
+    out.append("")
+    return "\n".join(out)
+
+
+def print_dashboard():
+    """Print the sync dashboard."""
+    out = []
+    out.append(_SEP_DOUBLE)
+    out.append("DARWIN SKILLS.SH SYNC")
+    out.append(_SEP_DOUBLE)
+    out.append("")
+
+    # Detect stack
+    stack = detect_stack()
+    installed_external = frozenset(get_installed_external())
+    darwin_skills = get_darwin_skills()
+
+    out.append(f"YOUR STACK: {', '.join(stack) if stack else 'Not detected'}")
+    out.append(f"DARWIN SKILLS: {len(darwin_skills)}")
+    out.append(f"EXTERNAL SKILLS: {len(installed_external)}")
+    out.append("")
 
-    print("═══════════════════════════════════════════════════")
-    print("COMMANDS:")
-    print("  /darwin sync install <name>  - Install a skill")
-    print("  /darwin sync search <query>  - Search skills.sh")
-    print("  /darwin sync upgrade         - Check for updates")
-    print("═══════════════════════════════════════════════════")
+    out.append(_render_static_trending_block())
+    out.append(_render_dynamic_block(installed_external, tuple(stack)))
+
+    out.append(_SEP_DOUBLE)
+    out.append("COMMANDS:")
+    out.append("  /darwin sync install <name>  - Install a skill")
+    out.append("  /darwin sync search <query>  - Search skills.sh")
+    out.append("  /darwin sync upgrade         - Check for updates")
+    out.append(_SEP_DOUBLE)
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def print_trending():
     """Print trending skills."""
-    print("═══════════════════════════════════════════════════")
-    print("TRENDING ON SKILLS.SH")
-    print("═══════════════════════════════════════════════════")
-    print()
-
-    print("HOT (24h)")
-    print("───────────────────────────────────────────────────")
+    out = []
+    out.append(_SEP_DOUBLE)
+    out.append("TRENDING ON SKILLS.SH")
+    out.append(_SEP_DOUBLE)
+    out.append("")
+
+    out.append("HOT (24h)")
+    out.append(_SEP_SINGLE)
     for skill in CURATED_SKILLS["hot_24h"]:
-        print(f" 🔥 {skill['name']:40} +{skill['delta']:,}")
-    print()
+        out.append(_FIRE_LINE % (skill["name"], format(skill["delta"], ",")))
+    out.append("")
 
-    print("TOP BY INSTALLS")
-    print("───────────────────────────────────────────────────")
+    out.append("TOP BY INSTALLS")
+    out.append(_SEP_SINGLE)
     for i, skill in enumerate(CURATED_SKILLS["trending"], 1):
-        print(f" {i:2}. {skill['name']:40} {skill['installs']:>7,}")
-    print()
+        out.append(_RANK_LINE % (i, skill["name"], format(skill["installs"], ",")))
+    out.append("")
 
-    print("═══════════════════════════════════════════════════")
+    out.append(_SEP_DOUBLE)
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -335,8 +680,7 @@ def main():
     elif args[0] == "trending":
         print_trending()
     elif args[0] == "install" and len(args) > 1:
-        skill_name = args[1]
-        install_skill(skill_name)
+        install_skills(args[1:])
     elif args[0] == "upgrade":
         upgrades = check_upgrades()
         if upgrades:
@@ -345,6 +689,9 @@ def main():
                 print(f"  {u['name']}: {u['current']} → {u['latest']}")
         else:
             print("All skills are up to date.")
+    elif args[0] == "refresh":
+        shutil.rmtree(HTTP_CACHE_DIR, ignore_errors=True)
+        print("Cleared cached skills.sh responses.")
     elif args[0] == "search" and len(args) > 1:
         query = " ".join(args[1:])
         results = search_skills(query)
@@ -352,7 +699,7 @@ def main():
         for r in results:
             print(f"  {r['name']:40} {r.get('installs', 0):>7,} installs")
     else:
-        print("Unknown command. Use: trending, install, upgrade, search")
+        print("Unknown command. Use: trending, install, upgrade, search, refresh")
 
 
 if __name__ == "__main__":